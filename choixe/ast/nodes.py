@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-
-# from dataclasses import dataclass
-from pydantic.dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import sys
+from abc import ABC
+from dataclasses import dataclass, fields
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from weakref import WeakValueDictionary
 
 
 class NodeVisitor:  # pragma: no cover
@@ -21,8 +32,30 @@ class NodeVisitor:  # pragma: no cover
 
     All the methods of `NodeVisitor` are called `visit_<node_type>`, they take as input
     the corresponding node object, and they can return anything.
+
+    Every visitor class owns a dispatch table, built once when the class is created,
+    that maps each node type to the corresponding `visit_<node_type>` function, so
+    that `Node.accept` does not need to look up the visiting method on every call.
     """
 
+    _DISPATCH: Dict[Type[Node], Callable[[NodeVisitor, Node], Any]]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._DISPATCH = _DispatchTable(cls)
+
+    def visit(self, node: Node) -> Any:
+        """Visits a node, calling the `visit_<node_type>` method corresponding to its
+        type. Equivalent to `node.accept(self)`.
+
+        Args:
+            node (Node): The node to visit.
+
+        Returns:
+            Any: The visitor result.
+        """
+        return self._DISPATCH[type(node)](self, node)
+
     def visit_dict(self, node: DictNode) -> Any:
         return node
 
@@ -72,15 +105,46 @@ class NodeVisitor:  # pragma: no cover
         return node
 
 
+class _DispatchTable(dict):
+    """Mapping from node types to the `visit_<node_type>` functions of a visitor class.
+    It is filled with all the known node types on creation, node types that are defined
+    later are resolved and stored on first access."""
+
+    def __init__(self, visitor_cls: Type[NodeVisitor]) -> None:
+        super().__init__()
+        self._visitor_cls = visitor_cls
+
+        to_scan = list(Node.__subclasses__())
+        while to_scan:
+            node_cls = to_scan.pop()
+            to_scan.extend(node_cls.__subclasses__())
+            if hasattr(node_cls, "_visitor_method"):
+                self[node_cls]
+
+    def __missing__(self, node_cls: Type[Node]) -> Callable[[NodeVisitor, Node], Any]:
+        fn = getattr(self._visitor_cls, node_cls._visitor_method)
+        self[node_cls] = fn
+        return fn
+
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+"""Keyword arguments for `dataclass` to generate `__slots__` for nodes, when supported.
+Nodes are created in large numbers, slots make them lighter and faster to build."""
+
+
 @dataclass
 class Node(ABC):
     """A generic element of the Choixe AST, all nodes must implement this interface."""
 
-    @abstractmethod
-    def accept(self, visitor: NodeVisitor) -> Any:  # pragma: no cover
-        """Accepts an incoming visitor. This method should simply call the respective
-        `visit_<node_type>` method of the visiting object, pass `self` as argument
-        and forward the result.
+    __slots__ = ()
+
+    _visitor_method: ClassVar[str]
+    """Name of the `visit_<node_type>` method of `NodeVisitor` handling this node."""
+
+    def accept(self, visitor: NodeVisitor) -> Any:
+        """Accepts an incoming visitor. This method calls the respective
+        `visit_<node_type>` method of the visiting object, passing `self` as argument
+        and forwarding the result.
 
         Args:
             visitor (NodeVisitor): The visiting object.
@@ -88,188 +152,301 @@ class Node(ABC):
         Returns:
             Any: The visitor result.
         """
-        pass
+        return visitor._DISPATCH[type(self)](visitor, self)
 
 
 @dataclass
 class HashNode(Node):
     """A `HashNode` is a special type of node that is hashable. It represents an
-    immutable structure and can generally be used as a dictionary key."""
+    immutable structure and can generally be used as a dictionary key.
+
+    Since the node is immutable, its hash is computed once, on first use, and cached.
+    """
+
+    __slots__ = ("_hash", "__weakref__")
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, f.name) for f in fields(self))
 
     def __hash__(self) -> int:
-        return hash(tuple(self.__dict__.values()))
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(self._values())
+            return self._hash
 
     def __eq__(self, __o: object) -> bool:
-        return self.__class__ == __o.__class__ and hash(self) == hash(__o)
+        if self is __o:
+            return True
+        if self.__class__ is not __o.__class__:
+            return False
+        # Cached hashes cheaply tell apart most of the different nodes
+        return hash(self) == hash(__o) and self._values() == __o._values()
 
 
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class DictNode(Node):
     """AST node for Mapping-like structures. Contains a mapping from `HashNode` to `Node`."""
 
+    _visitor_method = "visit_dict"
+
     nodes: Dict[HashNode, Node]
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_dict(self)
+    @classmethod
+    def build(cls, items: Iterable[Tuple[HashNode, Node]]) -> DictNode:
+        """Builds a `DictNode` directly from an iterable of key-value pairs, without
+        going through an intermediate dictionary.
 
+        Args:
+            items (Iterable[Tuple[HashNode, Node]]): The key-value pairs.
+
+        Returns:
+            DictNode: The built node.
+        """
+        self = cls.__new__(cls)
+        self.nodes = dict(items)
+        return self
 
-@dataclass(init=False)
+    def __eq__(self, __o: object) -> bool:
+        # Subtrees are often shared, compare them by identity before walking them
+        if self is __o:
+            return True
+        if self.__class__ is not __o.__class__:
+            return NotImplemented
+        return self.nodes == __o.nodes
+
+
+@dataclass(init=False, eq=False, **_SLOTS)
 class ListNode(Node):
     """AST node for List-like structures. Contains a list of `Node` objects."""
 
-    nodes: List[Node]
+    _visitor_method = "visit_list"
+
+    nodes: Tuple[Node, ...]
 
     def __init__(self, *nodes: Node) -> None:
         self.nodes = nodes
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_list(self)
+    @classmethod
+    def build(cls, nodes: Iterable[Node]) -> ListNode:
+        """Builds a `ListNode` directly from an iterable of nodes, without unpacking
+        them as arguments.
 
+        Args:
+            nodes (Iterable[Node]): The nodes.
 
-@dataclass(eq=False)
+        Returns:
+            ListNode: The built node.
+        """
+        self = cls.__new__(cls)
+        self.nodes = tuple(nodes)
+        return self
+
+    def __eq__(self, __o: object) -> bool:
+        # Subtrees are often shared, compare them by identity before walking them
+        if self is __o:
+            return True
+        if self.__class__ is not __o.__class__:
+            return NotImplemented
+        return self.nodes == __o.nodes
+
+
+@dataclass(eq=False, **_SLOTS)
 class LiteralNode(HashNode):
     """An `LiteralNode` contains a single generic hashable python object, like a built-in
     int, float or str."""
 
+    _visitor_method = "visit_object"
+
+    _INTERNED: ClassVar[WeakValueDictionary] = WeakValueDictionary()
+    _INTERNED_TYPES: ClassVar[FrozenSet[type]] = frozenset({str, int, bool, type(None)})
+
     data: Any
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_object(self)
+    @classmethod
+    def get(cls, data: Any) -> LiteralNode:
+        """Returns a `LiteralNode` containing the given data, reusing a live node with
+        the same data when possible. Configurations contain lots of duplicate keys and
+        values, sharing their nodes saves memory and turns most comparisons into
+        identity checks.
+
+        Args:
+            data (Any): The data to wrap.
+
+        Returns:
+            LiteralNode: A node containing the given data.
+        """
+        type_ = type(data)
+        # The type is part of the key, so that e.g. 1 and True are not conflated.
+        # Floats are excluded, as 0.0 and -0.0 compare equal.
+        if type_ not in cls._INTERNED_TYPES:
+            return cls(data)
+
+        key = (cls, type_, data)
+        node = cls._INTERNED.get(key)
+        if node is None:
+            # Interned strings compare by identity with other interned strings, like
+            # the keys of the processed dictionaries.
+            if type_ is str:
+                data = sys.intern(data)
+            node = cls._INTERNED[key] = cls(data)
+        return node
+
 
+def _is_str_literal(node: Optional[Node]) -> bool:
+    return type(node) is LiteralNode and type(node.data) is str
 
-@dataclass(init=False, eq=False)
+
+@dataclass(init=False, eq=False, **_SLOTS)
 class StrBundleNode(HashNode):
-    """A `StrBundleNode` represents a concatenation of a sequence of strings."""
+    """A `StrBundleNode` represents a concatenation of a sequence of strings.
+
+    Nested bundles are flattened and adjacent string literals are merged on
+    construction, as they would be by the parser.
+    """
 
-    nodes: List[HashNode]
+    _visitor_method = "visit_str_bundle"
+
+    nodes: Tuple[HashNode, ...]
 
     def __init__(self, *nodes: HashNode) -> None:
-        self.nodes = nodes
+        flat: List[HashNode] = []
+        for x in nodes:
+            for y in x.nodes if isinstance(x, StrBundleNode) else (x,):
+                prev = flat[-1] if flat else None
+                if _is_str_literal(y) and _is_str_literal(prev):
+                    flat[-1] = LiteralNode.get(prev.data + y.data)
+                else:
+                    flat.append(y)
+        self.nodes = tuple(flat)
+
+    @classmethod
+    def build(cls, nodes: Iterable[HashNode]) -> StrBundleNode:
+        """Builds a `StrBundleNode` directly from an iterable of nodes, without unpacking
+        them as arguments. Unlike the constructor, the nodes are used as they are.
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_str_bundle(self)
+        Args:
+            nodes (Iterable[HashNode]): The nodes.
 
+        Returns:
+            StrBundleNode: The built node.
+        """
+        self = cls.__new__(cls)
+        self.nodes = tuple(nodes)
+        return self
 
-@dataclass(eq=False)
+
+@dataclass(eq=False, **_SLOTS)
 class VarNode(HashNode):
     """A `VarNode` represents a Choixe variable. It has an id and a default value."""
 
+    _visitor_method = "visit_var"
+
     identifier: LiteralNode
     default: Optional[LiteralNode] = None
     env: Optional[LiteralNode] = None
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_var(self)
-
 
-@dataclass
+@dataclass(**_SLOTS)
 class ImportNode(Node):
     """An `ImportNode` represents a Choixe import directive from a filesystem path."""
 
-    path: LiteralNode
+    _visitor_method = "visit_import"
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_import(self)
+    path: LiteralNode
 
 
-@dataclass(init=False, eq=False)
+@dataclass(init=False, eq=False, **_SLOTS)
 class SweepNode(HashNode):
     """A `SweepNode` represents a Choixe sweep directive from multiple branching options."""
 
-    cases: List[Node]
+    _visitor_method = "visit_sweep"
+
+    cases: Tuple[Node, ...]
 
     def __init__(self, *cases: Node) -> None:
         self.cases = cases
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_sweep(self)
-
 
-@dataclass
+@dataclass(**_SLOTS)
 class InstanceNode(Node):
     """An `InstanceNode` represents a Choixe instance block to get the result of a
     generic python callable object."""
 
+    _visitor_method = "visit_instance"
+
     symbol: LiteralNode
     args: DictNode
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_instance(self)
-
 
-@dataclass
+@dataclass(**_SLOTS)
 class ModelNode(InstanceNode):
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_model(self)
+    _visitor_method = "visit_model"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ForNode(Node):
     """A `ForNode` represents a Choixe for loop that iterates over a collection picked
     from the context. A for loop also has an string identifier, that mast be a valid
     python id."""
 
+    _visitor_method = "visit_for"
+
     iterable: LiteralNode
     body: Node
     identifier: Optional[LiteralNode] = None
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_for(self)
-
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class IndexNode(HashNode):
     """An `IndexNode` represents the index of the current iteration of a for loop."""
 
-    identifier: Optional[LiteralNode] = None
+    _visitor_method = "visit_index"
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_index(self)
+    identifier: Optional[LiteralNode] = None
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class ItemNode(HashNode):
     """An `ItemNode` represents the item of the current iteration of a for loop."""
 
-    identifier: Optional[LiteralNode] = None
+    _visitor_method = "visit_item"
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_item(self)
+    identifier: Optional[LiteralNode] = None
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class UuidNode(HashNode):
     """An `UuidNode` represents a randomly generated uuid."""
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_uuid(self)
+    _visitor_method = "visit_uuid"
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class DateNode(HashNode):
     """A `DateNode` represents the current datetime with an optional custom format."""
 
-    format: Optional[LiteralNode] = None
+    _visitor_method = "visit_date"
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_date(self)
+    format: Optional[LiteralNode] = None
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class CmdNode(HashNode):
     """A `CmdNode` represents the calling of a system command."""
 
-    command: LiteralNode
+    _visitor_method = "visit_cmd"
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_cmd(self)
+    command: LiteralNode
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, **_SLOTS)
 class TmpDirNode(HashNode):
     """A `TmpDirNode` represents the creation of a temporary directory."""
 
+    _visitor_method = "visit_tmp_dir"
+
     name: Optional[LiteralNode] = None
 
-    def accept(self, visitor: NodeVisitor) -> Any:
-        return visitor.visit_tmp_dir(self)
+
+NodeVisitor._DISPATCH = _DispatchTable(NodeVisitor)
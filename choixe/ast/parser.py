@@ -1,7 +1,21 @@
 import ast
+import functools
+import keyword
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, OrderedDict, Tuple, Type, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import astunparse
 from choixe.ast.nodes import (
@@ -23,7 +37,6 @@ from choixe.ast.nodes import (
     UuidNode,
     VarNode,
 )
-from schema import Schema
 
 DIRECTIVE_PREFIX = "$"
 """Prefix used at the start of all Choixe directives."""
@@ -45,23 +58,60 @@ class ChoixeStructValidationError(ChoixeParsingError):
     pass
 
 
-@dataclass
+_NOT_SIMPLE = object()
+"""Sentinel for values that the simple directive scanner is unable to handle."""
+
+
+@dataclass(frozen=True)
 class Token:
     name: str
-    args: List[Any]
-    kwargs: Dict[str, Any]
+    args: Tuple[Any, ...]
+    kwargs: Mapping[str, Any]
+
+    def __post_init__(self) -> None:
+        # Tokens are cached and shared between parses, so kwargs must be read-only too
+        object.__setattr__(self, "kwargs", MappingProxyType(dict(self.kwargs)))
+
+    def __repr__(self) -> str:
+        # Shown in parsing errors, same as when kwargs was a plain dict
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, args={self.args!r}, "
+            f"kwargs={dict(self.kwargs)!r})"
+        )
 
 
 class Scanner:
     """Choixe Scanner of python str objects."""
 
-    DIRECTIVE_RE = (
-        rf"(?:\$[^\)\( \.\,\$]+\([^\(\)]*\))|(?:\$[^\)\( \.\,\$]+)|(?:[^\$]*)"
+    DIRECTIVE_RE = r"\$(?P<directive>[^)( .,$]+(?:\([^()]*\))?)|(?P<string>[^$]+)"
+    """Regex used to check if a string is a Choixe directive. The directive name is
+    shared by the compact and call forms, so that each position is tried against a
+    single directive branch, and plain strings never produce empty matches. Exactly one
+    of the named groups is non-empty in every match."""
+
+    _DIRECTIVE_PAT = re.compile(DIRECTIVE_RE)
+
+    # Patterns for the simple directives that can be scanned without the python parser:
+    # the directive name, optionally followed by a list of comma separated arguments,
+    # each made of an optional keyword and either a quoted string or a bare word.
+    _SIMPLE_CALL_PAT = re.compile(r"(\w+)(?:\((.*)\))?", re.ASCII | re.DOTALL)
+    # Only the whitespace accepted by the python tokenizer separates arguments, anything
+    # else (e.g. vertical tabs) is left to the python parser, that rejects it.
+    _SIMPLE_ARG_PAT = re.compile(
+        r"""[ \t\f\r\n]*(?:([A-Za-z_]\w*)[ \t\f\r\n]*=(?!=)[ \t\f\r\n]*)?"""
+        r"""("[^"\\\r\n\0]*"|'[^'\\\r\n\0]*'|[^ \t\f\r\n,"'=]+)"""
+        r"""[ \t\f\r\n]*(?:,|\Z)""",
+        re.ASCII,
     )
-    """Regex used to check if a string is a Choixe directive."""
+    _SIMPLE_NUMBER_PAT = re.compile(
+        r"(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?", re.ASCII
+    )
+    _SIMPLE_NAME_PAT = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*", re.ASCII)
+    _SIMPLE_CONSTANTS = {"True": True, "False": False, "None": None}
 
+    @classmethod
     def _scan_argument(
-        self, py_arg: Union[ast.Constant, ast.Attribute, ast.Name]
+        cls, py_arg: Union[ast.Constant, ast.Attribute, ast.Name]
     ) -> Any:
         if isinstance(py_arg, ast.Constant):
             return py_arg.value
@@ -75,7 +125,71 @@ class Scanner:
         else:
             raise ChoixeSyntaxError(py_arg.__class__)
 
-    def _scan_directive(self, code: str) -> Token:
+    @classmethod
+    def _scan_simple_argument(cls, code: str) -> Any:
+        if code[0] in "\"'":
+            return code[1:-1]
+        elif code in cls._SIMPLE_CONSTANTS:
+            return cls._SIMPLE_CONSTANTS[code]
+        elif cls._SIMPLE_NUMBER_PAT.fullmatch(code):
+            if not code.isdigit():
+                return float(code)
+            elif code[0] == "0" and code.strip("0"):  # Python forbids leading zeros
+                return _NOT_SIMPLE
+            else:
+                return int(code)
+        elif cls._SIMPLE_NAME_PAT.fullmatch(code):
+            if any(keyword.iskeyword(x) for x in code.split(".")):
+                return _NOT_SIMPLE
+            return code
+        else:
+            return _NOT_SIMPLE
+
+    @classmethod
+    def _scan_simple_directive(cls, code: str) -> Optional[Token]:
+        match = cls._SIMPLE_CALL_PAT.fullmatch(code)
+        if match is None:
+            return None
+
+        token_name, args_code = match.groups()
+        args, kwargs = [], {}
+        pos = 0
+        while args_code is not None and pos < len(args_code):
+            match = cls._SIMPLE_ARG_PAT.match(args_code, pos)
+            if match is None:
+                return None
+            pos = match.end()
+
+            key, value = match.groups()
+            value = cls._scan_simple_argument(value)
+            if value is _NOT_SIMPLE:
+                return None
+
+            if key is None:
+                if len(kwargs) > 0:  # Positional argument after keyword argument
+                    return None
+                args.append(value)
+            else:
+                if key in kwargs or keyword.iskeyword(key):
+                    return None
+                kwargs[key] = value
+
+        return Token(token_name, tuple(args), kwargs)
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _scan_directive(cls, code: str) -> Token:
+        # Most directives have a trivial syntax and are scanned with a few regex, all
+        # the other ones are handed to the (much slower) python parser, which also takes
+        # care of raising syntax errors. The same directive often appears in different
+        # strings, so tokens are cached here too, and shared as well.
+        token = cls._scan_simple_directive(code)
+        if token is None:
+            token = cls._scan_python_directive(code)
+        return token
+
+    @classmethod
+    def _scan_python_directive(cls, code: str) -> Token:
         try:
             py_ast = ast.parse(f"_{code}")  # Add "_" to avoid conflicts with python
         except SyntaxError as e:
@@ -97,14 +211,28 @@ class Scanner:
 
         args = []
         for py_arg in py_args:
-            args.append(self._scan_argument(py_arg))
+            args.append(cls._scan_argument(py_arg))
 
         kwargs = {}
         for py_kwarg in py_kwargs:
             key, value = py_kwarg.arg, py_kwarg.value
-            kwargs[key] = self._scan_argument(value)
+            kwargs[key] = cls._scan_argument(value)
+
+        return Token(token_name, tuple(args), kwargs)
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _scan(cls, data: str) -> Tuple[Token, ...]:
+        # The scanner is stateless: the same string always results in the same tokens,
+        # which are immutable and shared between calls.
+        res = []
+        for directive, string in cls._DIRECTIVE_PAT.findall(data):
+            if directive:
+                res.append(cls._scan_directive(directive))
+            else:
+                res.append(Token("str", (string,), {}))
 
-        return Token(token_name, args, kwargs)
+        return tuple(res)
 
     def scan(self, data: str) -> List[Token]:
         """Transforms a string into a list of parsed tokens.
@@ -115,18 +243,13 @@ class Scanner:
         Returns:
             List[Token]: The list of parsed tokens.
         """
-        res = []
-        tokens = re.findall(self.DIRECTIVE_RE, data)
-        for token in tokens:
-            if len(token) == 0:
-                continue
-            if token.startswith(DIRECTIVE_PREFIX):
-                token = self._scan_directive(token[len(DIRECTIVE_PREFIX) :])
-            else:
-                token = Token("str", [token], {})
-            res.append(token)
+        return list(self._scan(data))
 
-        return res
+
+_Frame = Tuple[Optional[List[Node]], Iterator[Any], List[Node]]
+"""A container being parsed: the key nodes for dictionaries or None for lists, an
+iterator over the children still to parse and the nodes of the children parsed so far.
+"""
 
 
 class Parser:
@@ -134,136 +257,169 @@ class Parser:
 
     def __init__(self) -> None:
         self._scanner = Scanner()
+        # Nodes are immutable, the same string can always share the same node
+        self._parse_str = functools.lru_cache(maxsize=8192)(self._parse_str_uncached)
         self._type_map = {
             dict: self._parse_dict,
             list: self._parse_list,
             tuple: self._parse_list,
             str: self._parse_str,
+            # Common literals, so that they are found by the exact type lookup
+            int: LiteralNode.get,
+            float: LiteralNode.get,
+            bool: LiteralNode.get,
+            type(None): LiteralNode.get,
         }
 
-        self._call_forms = {
-            self._token_schema("var"): VarNode,
-            self._token_schema("import"): ImportNode,
-            self._token_schema("sweep"): SweepNode,
-            self._token_schema("index"): IndexNode,
-            self._token_schema("item"): ItemNode,
-            self._token_schema("uuid"): UuidNode,
-            self._token_schema("date"): DateNode,
-            self._token_schema("cmd"): CmdNode,
-            self._token_schema("tmp"): TmpDirNode,
+        self._call_forms: Dict[str, Callable[..., Node]] = {
+            "var": VarNode,
+            "import": ImportNode,
+            "sweep": SweepNode,
+            "index": IndexNode,
+            "item": ItemNode,
+            "uuid": UuidNode,
+            "date": DateNode,
+            "cmd": CmdNode,
+            "tmp": TmpDirNode,
         }
 
+        # Extended and special forms are dictionaries whose keys are all directives,
+        # they are indexed by the set of directive names, and each one specifies the
+        # expected type of the value associated to every directive.
+        special_forms: List[Tuple[Dict[str, Type], Callable[..., Node]]] = [
+            (
+                {"directive": str, "args": list, "kwargs": dict},
+                self._parse_extended_form,
+            ),
+            ({"call": str, "args": dict}, self._parse_instance),
+            ({"model": str, "args": dict}, self._parse_model),
+            ({"for": object}, self._parse_for),
+        ]
         self._extended_and_special_forms = {
-            Schema(
-                {
-                    self._token_schema("directive"): str,
-                    self._token_schema("args"): list,
-                    self._token_schema("kwargs"): dict,
-                }
-            ): self._parse_extended_form,
-            Schema(
-                {self._token_schema("call"): str, self._token_schema("args"): dict}
-            ): self._parse_instance,
-            Schema(
-                {self._token_schema("model"): str, self._token_schema("args"): dict}
-            ): self._parse_model,
-            Schema({self._token_schema("for"): object}): self._parse_for,
+            frozenset(value_types): (value_types, fn)
+            for value_types, fn in special_forms
         }
+        self._max_form_size = max(len(x) for x, _ in special_forms)
 
-    def _token_schema(
-        self,
-        name: str,
-        args: Optional[OrderedDict[str, Type]] = None,
-        kwargs: Optional[OrderedDict[str, Type]] = None,
-    ) -> Schema:
-        args = OrderedDict() if args is None else args
-        kwargs = OrderedDict() if kwargs is None else kwargs
-
-        def _validator(token: Union[str, Token]) -> bool:
-            if isinstance(token, str):
-                tokens = self._scanner.scan(token)
-                if len(tokens) != 1:
-                    return False
-                token = tokens[0]
-
-            if token.name != name:
-                return False
-
-            return True
-
-        return Schema(_validator)
-
-    def _key_value_pairs_by_token_name(
-        self, data: Dict[str, Any]
-    ) -> Dict[str, Tuple[Token, Any]]:
-        res = {}
-        for k, v in data.items():
-            token = self._scanner.scan(k)[0]
-            res[token.name] = (token, v)
-        return res
-
-    def _parse_extended_form(self, data: dict) -> Node:
-        pairs = self._key_value_pairs_by_token_name(data)
-        token = Token(pairs["directive"][1], pairs["args"][1], pairs["kwargs"][1])
+    def _parse_extended_form(self, pairs: Dict[str, Tuple[Token, Any]]) -> Node:
+        token = Token(
+            pairs["directive"][1], tuple(pairs["args"][1]), pairs["kwargs"][1]
+        )
         return self._parse_token(token)
 
-    def _parse_instance(self, data: dict) -> InstanceNode:
-        pairs = self._key_value_pairs_by_token_name(data)
-        symbol = LiteralNode(pairs["call"][1])
+    def _parse_instance(self, pairs: Dict[str, Tuple[Token, Any]]) -> InstanceNode:
+        symbol = LiteralNode.get(pairs["call"][1])
         args = self.parse(pairs["args"][1])
         return InstanceNode(symbol, args)
 
-    def _parse_model(self, data: dict) -> ModelNode:
-        pairs = self._key_value_pairs_by_token_name(data)
-        symbol = LiteralNode(pairs["model"][1])
+    def _parse_model(self, pairs: Dict[str, Tuple[Token, Any]]) -> ModelNode:
+        symbol = LiteralNode.get(pairs["model"][1])
         args = self.parse(pairs["args"][1])
         return ModelNode(symbol, args)
 
-    def _parse_for(self, data: dict) -> ForNode:
-        pairs = self._key_value_pairs_by_token_name(data)
+    def _parse_for(self, pairs: Dict[str, Tuple[Token, Any]]) -> ForNode:
         loop, body = pairs["for"]
-        iterable = LiteralNode(loop.args[0])
+        iterable = LiteralNode.get(loop.args[0])
         identifier = (
             loop.args[1] if len(loop.args) > 1 else loop.kwargs.get("identifier")
         )
-        identifier = LiteralNode(identifier) if identifier else None
+        identifier = LiteralNode.get(identifier) if identifier else None
         return ForNode(iterable, self.parse(body), identifier=identifier)
 
-    def _parse_dict(self, data: dict) -> DictNode:
-        for schema, fn in self._extended_and_special_forms.items():
-            if schema.is_valid(data):
+    def _key_value_pairs_by_token_name(
+        self, data: dict
+    ) -> Optional[Dict[str, Tuple[Token, Any]]]:
+        # Scans every key of a dict only once, returns None if any key is not made of a
+        # single directive or if the same directive appears more than once.
+        res = {}
+        for k, v in data.items():
+            if not isinstance(k, str) or not k.startswith(DIRECTIVE_PREFIX):
+                return None
+            tokens = self._scanner.scan(k)
+            if len(tokens) != 1 or tokens[0].name in res:
+                return None
+            res[tokens[0].name] = (tokens[0], v)
+        return res
+
+    def _parse_dict(self, data: dict) -> Optional[Node]:
+        # Most dictionaries are too large to be special forms, skip them without
+        # looking at their keys.
+        pairs = None
+        if len(data) <= self._max_form_size:
+            pairs = self._key_value_pairs_by_token_name(data)
+
+        form = None
+        if pairs is not None:
+            form = self._extended_and_special_forms.get(frozenset(pairs))
+
+        if form is not None:
+            value_types, fn = form
+            if all(isinstance(pairs[k][1], t) for k, t in value_types.items()):
                 try:
-                    return fn(data)
+                    return fn(pairs)
                 except:
                     raise ChoixeStructValidationError(data)
 
-        return DictNode({self._parse_str(k): self.parse(v) for k, v in data.items()})
+        # Generic dictionaries are containers, built by `parse`
+        return None
+
+    def _parse_list(self, data: list) -> None:
+        # Lists are always containers, built by `parse`
+        return None
+
+    def _parse_node(self, data: Any) -> Optional[Node]:
+        # Parses anything but generic containers, for which None is returned.
+        # Exact type lookup first, subclasses of the supported types are rare.
+        fn = self._type_map.get(type(data))
+        if fn is None:
+            fn = LiteralNode.get
+            for type_, parse_fn in self._type_map.items():
+                if isinstance(data, type_):
+                    fn = parse_fn
+                    break
+        return fn(data)
 
-    def _parse_list(self, data: list) -> ListNode:
-        return ListNode(*[self.parse(x) for x in data])
+    def _open_container(self, data: Union[dict, list, tuple]) -> _Frame:
+        if isinstance(data, dict):
+            return [self._parse_str(k) for k in data], iter(data.values()), []
+        else:
+            return None, iter(data), []
 
     def _parse_token(self, token: Token) -> Node:
         if token.name == "str":
-            return LiteralNode(token.args[0])
+            return LiteralNode.get(token.args[0])
 
-        for schema, fn in self._call_forms.items():
-            if schema.is_valid(token):
-                args = [self.parse(x) for x in token.args]
-                kwargs = {k: self.parse(v) for k, v in token.kwargs.items()}
-                node = fn(*args, **kwargs)
-                return node
+        fn = self._call_forms.get(token.name)
+        if fn is None:
+            raise ChoixeTokenValidationError(token)
+
+        args = [self.parse(x) for x in token.args]
+        kwargs = {k: self.parse(v) for k, v in token.kwargs.items()}
 
-        raise ChoixeTokenValidationError(token)
+        # Sweeps are the only directives accepting arbitrary nodes as args
+        if fn is not SweepNode:
+            for x in [*args, *kwargs.values()]:
+                if not isinstance(x, LiteralNode):
+                    raise ChoixeTokenValidationError(token)
 
-    def _parse_str(self, data: str) -> Node:
+        return fn(*args, **kwargs)
+
+    def _parse_str_uncached(self, data: str) -> Node:
+        # Adjacent plain strings (e.g. separated by a lone "$") are merged into a single
+        # literal node.
         nodes = []
+        prev = None
         for token in self._scanner.scan(data):
+            if token.name == "str" and prev is not None and prev.name == "str":
+                token = Token("str", (prev.args[0] + token.args[0],), {})
+                nodes.pop()
             nodes.append(self._parse_token(token))
+            prev = token
 
         if len(nodes) == 1:
             return nodes[0]
         else:
-            return StrBundleNode(*nodes)
+            return StrBundleNode.build(nodes)
 
     def parse(self, data: Any) -> Node:
         """Recursively transforms an object into a visitable AST node.
@@ -274,26 +430,49 @@ class Parser:
         Returns:
             Node: The parsed Choixe AST node.
         """
+        # Containers are parsed with an explicit stack of frames rather than with
+        # recursion, so that deeply nested data cannot exceed the recursion limit.
+        # `current` tracks the object being parsed, to report it in case of errors.
+        # The type lookup of `_parse_node` is inlined for the most common types.
+        current = data
+        type_map = self._type_map
         try:
-            fn = LiteralNode
-            for type_, parse_fn in self._type_map.items():
-                if isinstance(data, type_):
-                    fn = parse_fn
-                    break
-            res = fn(data)
-            return res
+            node = self._parse_node(data)
+            if node is not None:
+                return node
+
+            stack = [self._open_container(data)]
+            while True:
+                keys, children, nodes = stack[-1]
+                for child in children:
+                    current = child
+                    fn = type_map.get(type(child))
+                    node = self._parse_node(child) if fn is None else fn(child)
+                    if node is None:
+                        stack.append(self._open_container(child))
+                        break
+                    nodes.append(node)
+                else:
+                    stack.pop()
+                    if keys is None:
+                        node = ListNode.build(nodes)
+                    else:
+                        node = DictNode.build(zip(keys, nodes))
+                    if not stack:
+                        return node
+                    stack[-1][2].append(node)
 
         except (ChoixeSyntaxError, SyntaxError) as e:
             code = e.args[0]
             raise ChoixeParsingError(
-                f'Error when parsing code "{code}" found in "{data}", expected either '
+                f'Error when parsing code "{code}" found in "{current}", expected either '
                 "a compact form like $DIRECTIVE, or a call form like "
                 "$DIRECTIVE(ARGS, KWARGS)."
             )
         except ChoixeTokenValidationError as e:
             token: Token = e.args[0]
             raise ChoixeParsingError(
-                f'Token "{token}" found in "{data}" does not validate against any of '
+                f'Token "{token}" found in "{current}" does not validate against any of '
                 "the available call forms. Please check that the directive and "
                 "argument names are spelled correctly and match the directive "
                 "signature."
@@ -317,4 +496,8 @@ def parse(data: Any) -> Node:
     Returns:
         Node: The parsed Choixe AST node.
     """
-    return Parser().parse(data)
+    return _PARSER.parse(data)
+
+
+_PARSER = Parser()
+"""Parser shared by all `parse` calls, so that its caches survive between them."""
@@ -1,25 +1,42 @@
+import functools
+import hashlib
 import importlib
 import importlib.util
 import os
 import sys
+from collections import Counter
 from contextlib import ContextDecorator
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Optional
-from uuid import uuid1
+from typing import Any, Optional, Tuple
 
 
 class sys_path(ContextDecorator):
     """sys_path context decorator that temporarily adds a path to sys.path"""
 
+    _REFS: Counter = Counter()
+    """Number of active contexts for each path, nested contexts on the same path only
+    modify sys.path once."""
+
     def __init__(self, path: Path) -> None:
-        self._new_cwd = path
+        self._new_cwd = str(path)
 
     def __enter__(self) -> None:
-        sys.path.insert(0, str(self._new_cwd))
+        if not self._REFS[self._new_cwd]:
+            sys.path.insert(0, self._new_cwd)
+        self._REFS[self._new_cwd] += 1
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        sys.path.pop(0)
+        self._REFS[self._new_cwd] -= 1
+        if self._REFS[self._new_cwd]:
+            return
+        del self._REFS[self._new_cwd]
+
+        # Remove by value, the imported code may have modified sys.path meanwhile
+        try:
+            sys.path.remove(self._new_cwd)
+        except ValueError:  # pragma: no cover
+            pass
 
 
 class sys_module(ContextDecorator):
@@ -49,6 +66,20 @@ class sys_module(ContextDecorator):
         sys.modules.pop(self._id_)
 
 
+@functools.lru_cache(maxsize=64)
+def _import_file(module_path: str, version: Optional[Tuple[int, int]]) -> ModuleType:
+    # A deterministic id lets every symbol imported from the same file version share
+    # a single execution of the module.
+    key = f"{module_path}:{version}".encode()
+    id_ = "choixe_dyn_" + hashlib.blake2b(key, digest_size=8).hexdigest()
+    with sys_path(Path(module_path).parent):
+        spec = importlib.util.spec_from_file_location(id_, module_path)
+        module_ = importlib.util.module_from_spec(spec)
+        with sys_module(module_, id_):
+            spec.loader.exec_module(module_)
+    return module_
+
+
 def import_symbol(symbol_path: str, cwd: Optional[Path] = None) -> Any:
     """Dynamically imports a given symbol. A symbol can be either:
 
@@ -79,13 +110,17 @@ def import_symbol(symbol_path: str, cwd: Optional[Path] = None) -> Any:
             if not module_path.is_absolute():
                 module_path = cwd / module_path
 
-            with sys_path(module_path.parent):
-                id_ = str(uuid1())
-                spec = importlib.util.spec_from_file_location(id_, str(module_path))
-                module_ = importlib.util.module_from_spec(spec)
-                with sys_module(module_, id_):
-                    spec.loader.exec_module(module_)
+            # The file version is part of the cache key, editing the file imports it
+            # again. The size catches rewrites within the same mtime tick.
+            try:
+                stat = module_path.stat()
+                version = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                version = None
+            module_ = _import_file(str(module_path.resolve()), version)
         else:
+            # Python modules are already cached in sys.modules, and must stay
+            # uncached here to honor reloads and patches.
             module_path, _, symbol_name = symbol_path.rpartition(".")
             module_ = importlib.import_module(module_path)
         res = getattr(module_, symbol_name)
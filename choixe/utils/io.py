@@ -4,10 +4,20 @@ from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+_YAML_EXTENSIONS = frozenset({"yaml", "yml"})
+_JSON_EXTENSIONS = frozenset({"json"})
+
 
 def get_extension(path: Path) -> str:
     """Returns the extension of a file, given a path."""
-    return path.name.split(".")[-1]
+    return path.name.rpartition(".")[2]
 
 
 def load(path: Path) -> Any:
@@ -22,11 +32,13 @@ def load(path: Path) -> Any:
     Returns:
         Any: The loaded object.
     """
-    ext = get_extension(path)
-    if ext in ["yaml", "yml"]:
-        return yaml.safe_load(open(path, "r"))
-    elif ext in ["json"]:
-        return json.load(open(path, "r"))
+    ext = get_extension(path).lower()
+    if ext in _YAML_EXTENSIONS:
+        with open(path, "r") as f:
+            return yaml.load(f, Loader=_YamlLoader)
+    elif ext in _JSON_EXTENSIONS:
+        with open(path, "r") as f:
+            return json.load(f)
 
 
 def dump(obj: Any, path: Path) -> None:
@@ -38,9 +50,11 @@ def dump(obj: Any, path: Path) -> None:
         obj (Any): The object to dump.
         path (Path): Path to the file to write.
     """
-    ext = get_extension(path)
+    ext = get_extension(path).lower()
     path.parent.mkdir(parents=True, exist_ok=True)
-    if ext in ["yaml", "yml"]:
-        yaml.safe_dump(obj, open(path, "w"))
-    elif ext in ["json"]:
-        json.dump(obj, open(path, "w"))
+    if ext in _YAML_EXTENSIONS:
+        with open(path, "w") as f:
+            yaml.dump(obj, f, Dumper=_YamlDumper)
+    elif ext in _JSON_EXTENSIONS:
+        with open(path, "w") as f:
+            json.dump(obj, f)
@@ -0,0 +1,33 @@
+import functools
+from pathlib import Path
+from typing import Optional, Tuple
+
+from choixe.ast.nodes import Node
+from choixe.ast.parser import parse
+from choixe.utils.io import load
+
+
+@functools.lru_cache(maxsize=128)
+def _load_and_parse(path: Path, version: Optional[Tuple[int, int]]) -> Node:
+    # The version is only part of the cache key, so that edited files are loaded again.
+    # The size catches rewrites within the same mtime tick.
+    return parse(load(path))
+
+
+def parse_import(path: Path) -> Node:
+    """Loads and parses an imported markup file, caching the result until the file is
+    modified.
+
+    Args:
+        path (Path): The path of the imported file.
+
+    Returns:
+        Node: The parsed Choixe AST node, shared by all the callers: it must not be
+        mutated.
+    """
+    try:
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    return _load_and_parse(path.resolve(), version)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable, Dict, Optional
 
 import numpy as np
 from choixe.ast.nodes import Node, LiteralNode
@@ -6,20 +6,38 @@ from choixe.visitors.unparser import Unparser
 from pydantic import BaseModel
 
 
+def _decode_model(data: BaseModel) -> Any:
+    symbol = f"{data.__module__}.{data.__class__.__qualname__}"
+    return {"$model": symbol, "$args": data.dict()}
+
+
+def _find_converter(type_: type) -> Optional[Callable[[Any], Any]]:
+    if issubclass(type_, np.ndarray):
+        return np.ndarray.tolist
+    elif issubclass(type_, np.generic):
+        return np.generic.item
+    elif issubclass(type_, BaseModel):
+        return _decode_model
+    else:
+        return None
+
+
 class Decoder(Unparser):
     """Specialization of the `Unparser` for the decode operation."""
 
+    _CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {}
+    """Converter to use for each type of data encountered so far, `None` if the data
+    needs no conversion."""
+
     def visit_object(self, node: LiteralNode) -> Any:
         data = super().visit_object(node)
-        if isinstance(data, np.ndarray):
-            return data.tolist()
-        elif "numpy" in str(type(data)):
-            return data.item()
-        elif isinstance(data, BaseModel):
-            symbol = f"{data.__module__}.{data.__class__.__qualname__}"
-            return {"$model": symbol, "$args": data.dict()}
-        else:
-            return data
+        type_ = type(data)
+        try:
+            converter = self._CONVERTERS[type_]
+        except KeyError:
+            converter = self._CONVERTERS[type_] = _find_converter(type_)
+
+        return data if converter is None else converter(data)
 
 
 def decode(node: Node) -> Any:
@@ -33,4 +51,4 @@ def decode(node: Node) -> Any:
     Returns:
         List[Tuple[List[Union[str, int]], Any]]: The decoded unparsed node.
     """
-    return node.accept(Decoder())
+    return Decoder().visit(node)
@@ -23,8 +23,7 @@ from choixe.ast.nodes import (
     SweepNode,
     VarNode,
 )
-from choixe.ast.parser import parse
-from choixe.utils.io import load
+from choixe.visitors._imports import parse_import
 
 
 @dataclass
@@ -53,20 +52,20 @@ class Inspector(NodeVisitor):
     def visit_dict(self, node: DictNode) -> Inspection:
         inspections = []
         for k, v in node.nodes.items():
-            inspections.append(k.accept(self))
-            inspections.append(v.accept(self))
+            inspections.append(self.visit(k))
+            inspections.append(self.visit(v))
         return sum(inspections, start=Inspection(processed=True))
 
     def visit_list(self, node: ListNode) -> Inspection:
         start = Inspection(processed=True)
-        return sum([x.accept(self) for x in node.nodes], start=start)
+        return sum([self.visit(x) for x in node.nodes], start=start)
 
     def visit_object(self, node: LiteralNode) -> Inspection:
         return Inspection(processed=True)
 
     def visit_str_bundle(self, node: StrBundleNode) -> Inspection:
         start = Inspection(processed=True)
-        return sum([x.accept(self) for x in node.nodes], start=start)
+        return sum([self.visit(x) for x in node.nodes], start=start)
 
     def visit_var(self, node: VarNode) -> Inspection:
         default = None if node.default is None else node.default.data
@@ -84,12 +83,11 @@ class Inspector(NodeVisitor):
             path = self._cwd / path
 
         if path.exists():
-            subdata = load(path)
-            parsed = parse(subdata)
+            parsed = parse_import(path)
 
             old_cwd = self._cwd
             self._cwd = path.parent
-            nested = parsed.accept(self)
+            nested = self.visit(parsed)
             self._cwd = old_cwd
         else:
             warnings.warn(f"Cannot complete inspection: file {path} is missing.")
@@ -99,17 +97,17 @@ class Inspector(NodeVisitor):
 
     def visit_sweep(self, node: SweepNode) -> Inspection:
         start = Inspection(processed=True)
-        return sum([x.accept(self) for x in node.cases], start=start)
+        return sum([self.visit(x) for x in node.cases], start=start)
 
     def visit_instance(self, node: InstanceNode) -> Inspection:
-        return Inspection(symbols={str(node.symbol.data)}) + node.args.accept(self)
+        return Inspection(symbols={str(node.symbol.data)}) + self.visit(node.args)
 
     def visit_model(self, node: ModelNode) -> Inspection:
         return self.visit_instance(node)
 
     def visit_for(self, node: ForNode) -> Inspection:
         iterable_insp = Inspection(variables=py_.set_({}, node.iterable.data, None))
-        body_insp = node.body.accept(self)
+        body_insp = self.visit(node.body)
         return iterable_insp + body_insp
 
     def visit_index(self, node: IndexNode) -> Inspection:
@@ -121,4 +119,4 @@ class Inspector(NodeVisitor):
 
 def inspect(node: Node, cwd: Optional[Path] = None) -> Inspection:
     inspector = Inspector(cwd=cwd)
-    return node.accept(inspector)
+    return inspector.visit(node)
@@ -1,12 +1,13 @@
+import functools
 import os
+import re
 import tempfile
 import uuid
-from copy import deepcopy
 from dataclasses import dataclass
 from datetime import datetime
 from itertools import product
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pydash as py_
 from choixe.ast.nodes import (
@@ -29,11 +30,56 @@ from choixe.ast.nodes import (
     UuidNode,
     VarNode,
 )
-from choixe.ast.parser import parse
 from choixe.utils.imports import import_symbol
-from choixe.utils.io import load
+from choixe.visitors._imports import parse_import
 from choixe.visitors.unparser import unparse
 
+_SIMPLE_PATH_PAT = re.compile(r"\w+(?:\.\w+)*", re.ASCII)
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=1024)
+def _simple_path(path: Any) -> Optional[Tuple[str, ...]]:
+    # Dot-separated words, for which walking nested dicts gives the same result as
+    # pydash, as long as every key is found.
+    if isinstance(path, str) and _SIMPLE_PATH_PAT.fullmatch(path):
+        return tuple(path.split("."))
+    return None
+
+
+def _get(data: Any, path: Any, default: Any = None) -> Any:
+    # Same as `pydash.get`, with a fast path for plain dicts and simple paths.
+    keys = _simple_path(path)
+    if keys is not None:
+        value = data
+        for key in keys:
+            if type(value) is not dict:
+                break
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                break
+        else:
+            return value
+    return py_.get(data, path, default)
+
+
+def _merge_dicts(items: Tuple[Dict, ...]) -> Dict:
+    res = {}
+    for item in items:
+        res.update(item)
+    return res
+
+
+def _merge_lists(items: Tuple[List, ...]) -> List:
+    res = []
+    for item in items:
+        res.extend(item)
+    return res
+
+
+def _merge_strs(items: Tuple[Any, ...]) -> str:
+    return "".join([str(item) for item in items])
+
 
 @dataclass
 class LoopInfo:
@@ -66,46 +112,79 @@ class Processor(NodeVisitor):
         self._cwd = cwd if cwd is not None else Path(os.getcwd())
         self._allow_branching = allow_branching
 
+        self._lookups: Dict[Any, Any] = {}
         self._loop_data: Dict[str, LoopInfo] = {}
         self._current_loop: Optional[str] = None
         self._tmp_name = str(uuid.uuid1())
 
+    def _lookup(self, path: Any, default: Any = None) -> Any:
+        # The context never changes while processing, so every path is looked up once.
+        try:
+            value = self._lookups[path]
+        except KeyError:
+            value = self._lookups[path] = _get(self._context, path, _MISSING)
+        return default if value is _MISSING else value
+
+    # Containers dispatch their children inline, saving a call for each of them.
+    # Every combination of the children branches gets its own container, built
+    # shallowly: combinations share the values produced by the children, which are
+    # never modified after being created. The first child varies the fastest, while
+    # product varies the last one the fastest, hence the reversals.
+
     def visit_dict(self, node: DictNode) -> List[Dict]:
-        data = [{}]
+        dispatch = self._DISPATCH
+        res = {}
+        fields = []
         for k, v in node.nodes.items():
-            branches = list(product(k.accept(self), v.accept(self)))
-            new_data = []
-            for _ in range(len(branches)):
-                new_data.extend(deepcopy(data))
-            for i, d in enumerate(new_data):
-                d[branches[i // len(data)][0]] = branches[i // len(data)][1]
-            data = new_data
-        return data
+            keys = dispatch[type(k)](self, k)
+            values = dispatch[type(v)](self, v)
+            if len(keys) == 1 and len(values) == 1 and res is not None:
+                res[keys[0]] = values[0]
+            else:
+                res = None
+            fields.append((keys, values))
+
+        # Single outcome, as for all dicts without sweeps
+        if res is not None:
+            return [res]
+
+        fields = [list(product(keys, values)) for keys, values in reversed(fields)]
+        return [dict(reversed(c)) for c in product(*fields)]
 
     def visit_list(self, node: ListNode) -> List[List]:
-        data = [[]]
+        dispatch = self._DISPATCH
+        res = []
+        children = []
         for x in node.nodes:
-            branches = x.accept(self)
-            new_data = []
-            for _ in range(len(branches)):
-                new_data.extend(deepcopy(data))
-            for i, d in enumerate(new_data):
-                d.append(branches[i // len(data)])
-            data = new_data
-        return data
+            branches = dispatch[type(x)](self, x)
+            if len(branches) == 1 and res is not None:
+                res.append(branches[0])
+            else:
+                res = None
+            children.append(branches)
+
+        # Single outcome, as for all lists without sweeps
+        if res is not None:
+            return [res]
+
+        children.reverse()
+        return [[*reversed(c)] for c in product(*children)]
 
     def visit_object(self, node: LiteralNode) -> List[Any]:
         return [node.data]
 
     def visit_str_bundle(self, node: StrBundleNode) -> List[str]:
-        data = [""]
+        dispatch = self._DISPATCH
+        parts = [[]]
         for x in node.nodes:
-            branches = x.accept(self)
-            N = len(data)
-            data *= len(branches)
-            for i in range(len(data)):
-                data[i] += str(branches[i // N])
-        return data
+            branches = dispatch[type(x)](self, x)
+            if len(branches) == 1:
+                fragment = str(branches[0])
+                for p in parts:
+                    p.append(fragment)
+            else:
+                parts = [[*p, str(b)] for b in branches for p in parts]
+        return ["".join(p) for p in parts]
 
     def visit_var(self, node: VarNode) -> List[Any]:
         default = None
@@ -115,19 +194,18 @@ class Processor(NodeVisitor):
         if node.env is not None and node.env.data:
             default = os.getenv(node.identifier.data, default=default)
 
-        return [py_.get(self._context, node.identifier.data, default)]
+        return [self._lookup(node.identifier.data, default)]
 
     def visit_import(self, node: ImportNode) -> List[Any]:
         path = Path(node.path.data)
         if not path.is_absolute():
             path = self._cwd / path
 
-        subdata = load(path)
-        parsed = parse(subdata)
+        parsed = parse_import(path)
 
         old_cwd = self._cwd
         self._cwd = path.parent
-        nested = parsed.accept(self)
+        nested = self.visit(parsed)
         self._cwd = old_cwd
 
         return nested
@@ -136,23 +214,23 @@ class Processor(NodeVisitor):
         if self._allow_branching:
             cases = []
             for x in node.cases:
-                cases.extend(x.accept(self))
+                cases.extend(self.visit(x))
             return cases
         else:
             return [unparse(node)]
 
     def visit_instance(self, node: InstanceNode) -> List[Any]:
         symbol = node.symbol.data
-        branches = node.args.accept(self)
+        branches = self.visit(node.args)
         return [import_symbol(symbol, cwd=self._cwd)(**x) for x in branches]
 
     def visit_model(self, node: ModelNode) -> Any:
         symbol = node.symbol.data
-        branches = node.args.accept(self)
+        branches = self.visit(node.args)
         return [import_symbol(symbol, cwd=self._cwd).parse_obj(x) for x in branches]
 
     def visit_for(self, node: ForNode) -> List[Any]:
-        iterable = py_.get(self._context, node.iterable.data)
+        iterable = self._lookup(node.iterable.data)
         id_ = str(uuid.uuid1()) if node.identifier is None else node.identifier.data
         prev_loop = self._current_loop
         self._current_loop = id_
@@ -160,23 +238,17 @@ class Processor(NodeVisitor):
         branches = []
         for i, x in enumerate(iterable):
             self._loop_data[self._current_loop] = LoopInfo(i, x)
-            branches.append(node.body.accept(self))
+            branches.append(self.visit(node.body))
 
         self._current_loop = prev_loop
 
-        branches = list(product(*branches))
-        for i, branch in enumerate(branches):
-            if isinstance(node.body, DictNode):
-                res = {}
-                [res.update(item) for item in branch]
-            elif isinstance(node.body, ListNode):
-                res = []
-                [res.extend(item) for item in branch]
-            else:
-                res = "".join([str(item) for item in branch])
-            branches[i] = res
-
-        return branches
+        if isinstance(node.body, DictNode):
+            merge = _merge_dicts
+        elif isinstance(node.body, ListNode):
+            merge = _merge_lists
+        else:
+            merge = _merge_strs
+        return [merge(branch) for branch in product(*branches)]
 
     def visit_index(self, node: IndexNode) -> List[Any]:
         id_ = self._current_loop if node.identifier is None else node.identifier.data
@@ -184,9 +256,9 @@ class Processor(NodeVisitor):
 
     def visit_item(self, node: ItemNode) -> List[Any]:
         key = self._current_loop if node.identifier is None else node.identifier.data
-        sep = "."
-        loop_id, _, key = key.partition(sep)
-        return [py_.get(self._loop_data[loop_id].item, f"{sep}{key}")]
+        loop_id, _, key = key.partition(".")
+        item = self._loop_data[loop_id].item
+        return [_get(item, key) if key else item]
 
     def visit_uuid(self, node: UuidNode) -> List[str]:
         return [str(uuid.uuid1())]
@@ -233,4 +305,4 @@ def process(
         have length 1.
     """
     processor = Processor(context=context, cwd=cwd, allow_branching=allow_branching)
-    return node.accept(processor)
+    return processor.visit(node)
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Union
+import re
+from typing import Any, ClassVar, Dict, FrozenSet, List, Tuple, Type, Union
 
 from choixe.ast.nodes import (
     CmdNode,
@@ -22,27 +23,102 @@ from choixe.ast.nodes import (
 )
 from choixe.ast.parser import DIRECTIVE_PREFIX
 
+_COMPACT_FORMS = {
+    x: f"{DIRECTIVE_PREFIX}{x}"
+    for x in [
+        "call",
+        "args",
+        "model",
+        "for",
+        "var",
+        "import",
+        "sweep",
+        "index",
+        "item",
+        "uuid",
+        "date",
+        "cmd",
+        "tmp",
+    ]
+}
+"""Compact forms of all the known directives, formatted once."""
+
+_ASCII_DOTTED_NAME_PAT = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*", re.ASCII)
+
+
+def _is_dotted_name(data: str) -> bool:
+    # Regex for the common ascii case, python identifiers also allow some unicode
+    if data.isascii():
+        return _ASCII_DOTTED_NAME_PAT.fullmatch(data) is not None
+    return all(x.isidentifier() for x in data.split("."))
+
 
 class Unparser(NodeVisitor):
     """`NodeVisitor` for the `unparse` operation."""
 
+    _MEMOIZED: ClassVar[FrozenSet[Type[Node]]] = frozenset(
+        {
+            StrBundleNode,
+            VarNode,
+            ImportNode,
+            SweepNode,
+            IndexNode,
+            ItemNode,
+            UuidNode,
+            DateNode,
+            CmdNode,
+            TmpDirNode,
+        }
+    )
+    """Node types whose unparsed strings are memoized. The parser shares the nodes of
+    repeated strings, so the same node object can appear many times in the AST."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._memo: Dict[int, Tuple[Node, str]] = {}
+
+    def visit(self, node: Node) -> Any:
+        type_ = type(node)
+        if type_ not in self._MEMOIZED:
+            return self._DISPATCH[type_](self, node)
+
+        # Memo entries keep the node alive, so that its id cannot be reused.
+        entry = self._memo.get(id(node))
+        if entry is not None and entry[0] is node:
+            return entry[1]
+
+        res = self._DISPATCH[type_](self, node)
+        if isinstance(res, str):  # Mutable results cannot be shared
+            self._memo[id(node)] = (node, res)
+        return res
+
+    # Containers dispatch their children inline, going through `visit` only for the
+    # memoized node types, which saves a call for every literal and nested container.
+
     def visit_dict(self, node: DictNode) -> Dict:
+        dispatch, memoized = self._DISPATCH, self._MEMOIZED
         data = {}
         for k, v in node.nodes.items():
-            data[k.accept(self)] = v.accept(self)
+            type_ = type(k)
+            k = self.visit(k) if type_ in memoized else dispatch[type_](self, k)
+            type_ = type(v)
+            data[k] = self.visit(v) if type_ in memoized else dispatch[type_](self, v)
         return data
 
     def visit_list(self, node: ListNode) -> List:
+        dispatch, memoized = self._DISPATCH, self._MEMOIZED
         data = []
         for x in node.nodes:
-            data.append(x.accept(self))
+            type_ = type(x)
+            x = self.visit(x) if type_ in memoized else dispatch[type_](self, x)
+            data.append(x)
         return data
 
     def visit_object(self, node: LiteralNode) -> Any:
         return node.data
 
     def visit_str_bundle(self, node: StrBundleNode) -> str:
-        return "".join(x.accept(self) for x in node.nodes)
+        return "".join([self.visit(x) for x in node.nodes])
 
     def visit_sweep(self, node: SweepNode) -> str:
         return self._unparse_auto("sweep", *node.cases)
@@ -60,14 +136,14 @@ class Unparser(NodeVisitor):
 
     def visit_instance(self, node: InstanceNode) -> Dict[str, Any]:
         return {
-            self._unparse_compact("call"): node.symbol.accept(self),
-            self._unparse_compact("args"): node.args.accept(self),
+            self._unparse_compact("call"): self.visit(node.symbol),
+            self._unparse_compact("args"): self.visit(node.args),
         }
 
     def visit_model(self, node: ModelNode) -> Dict[str, Any]:
         return {
-            self._unparse_compact("model"): node.symbol.accept(self),
-            self._unparse_compact("args"): node.args.accept(self),
+            self._unparse_compact("model"): self.visit(node.symbol),
+            self._unparse_compact("args"): self.visit(node.args),
         }
 
     def visit_for(self, node: ForNode) -> Dict[str, Any]:
@@ -75,7 +151,7 @@ class Unparser(NodeVisitor):
         if node.identifier is not None:
             args.append(node.identifier)
         key = self._unparse_call("for", node.iterable, *args)
-        value = node.body.accept(self)
+        value = self.visit(node.body)
         return {key: value}
 
     def visit_item(self, node: ItemNode) -> Any:
@@ -109,37 +185,35 @@ class Unparser(NodeVisitor):
         return self._unparse_auto("tmp", *args)
 
     def _unparse_as_arg(self, node: Node) -> str:
-        unparsed = node.accept(self)
+        unparsed = self.visit(node)
         if isinstance(unparsed, str):
-            if all([x.isidentifier() for x in unparsed.split(".")]):
+            if _is_dotted_name(unparsed):
                 return unparsed
             else:
                 return f'"{unparsed}"'
         else:
             return str(unparsed)
 
-    def _unparse_as_args(self, *nodes: Node) -> str:
-        return ", ".join([self._unparse_as_arg(x) for x in nodes])
-
-    def _unparse_as_kwargs(self, **nodes: Node) -> str:
-        return ", ".join([f"{k}={self._unparse_as_arg(v)}" for k, v in nodes.items()])
-
     def _unparse_compact(self, name: str) -> str:
-        return f"{DIRECTIVE_PREFIX}{name}"
+        res = _COMPACT_FORMS.get(name)
+        return f"{DIRECTIVE_PREFIX}{name}" if res is None else res
 
     def _unparse_call(self, name: str, *args: Node, **kwargs: Node) -> str:
-        parts = []
-        if len(args) > 0:
-            parts.append(self._unparse_as_args(*args))
-        if len(kwargs) > 0:
-            parts.append(self._unparse_as_kwargs(**kwargs))
-        return f"{self._unparse_compact(name)}({', '.join(parts)})"
+        parts = [self._unparse_compact(name), "("]
+        for x in args:
+            parts += [self._unparse_as_arg(x), ", "]
+        for k, v in kwargs.items():
+            parts += [k, "=", self._unparse_as_arg(v), ", "]
+        if len(parts) > 2:
+            parts.pop()  # Trailing separator
+        parts.append(")")
+        return "".join(parts)
 
     def _unparse_extended(self, name: str, *args: Node, **kwargs: Node) -> Dict:
         return {
             "$directive": name,
-            "$args": [x.accept(self) for x in args],
-            "$kwargs": {k: v.accept(self) for k, v in kwargs.items()},
+            "$args": [self.visit(x) for x in args],
+            "$kwargs": {k: self.visit(v) for k, v in kwargs.items()},
         }
 
     def _unparse_auto(self, name: str, *args: Node, **kwargs: Node) -> Union[Dict, str]:
@@ -182,4 +256,4 @@ def unparse(node: Node) -> Any:
         Any: The unparsed object.
     """
     unparser = Unparser()
-    return node.accept(unparser)
+    return unparser.visit(node)
@@ -32,30 +32,30 @@ class Walker(Unparser):
     """Specialization of the `Unparser` for the walk operation."""
 
     def visit_dict(self, node: DictNode) -> Chunk:
-        chunk = Chunk([])
+        entries = []
         for k, v in node.nodes.items():
-            key = k.accept(self)
-            value = v.accept(self)
+            key = self.visit(k)
+            value = self.visit(v)
             assert isinstance(key, str), "Only string keys are allowed in dict walk"
 
-            if not isinstance(value, Chunk):
-                value = Chunk([Entry([], value)])
+            if isinstance(value, Chunk):
+                entries.extend([e.prepend(key) for e in value.entries])
+            else:
+                entries.append(Entry([key], value))
 
-            chunk += value.prepend(key)
-
-        return chunk
+        return Chunk(entries)
 
     def visit_list(self, node: ListNode) -> Chunk:
-        chunk = Chunk([])
+        entries = []
         for i, x in enumerate(node.nodes):
-            value = x.accept(self)
-
-            if not isinstance(value, Chunk):
-                value = Chunk([Entry([], value)])
+            value = self.visit(x)
 
-            chunk += value.prepend(i)
+            if isinstance(value, Chunk):
+                entries.extend([e.prepend(i) for e in value.entries])
+            else:
+                entries.append(Entry([i], value))
 
-        return chunk
+        return Chunk(entries)
 
 
 def walk(node: Node) -> List[Tuple[List[Union[str, int]], Any]]:
@@ -89,7 +89,7 @@ def walk(node: Node) -> List[Tuple[List[Union[str, int]], Any]]:
     Returns:
         List[Tuple[List[Union[str, int]], Any]]: The flattened unparsed node.
     """
-    chunk: Chunk = node.accept(Walker())
+    chunk: Chunk = Walker().visit(node)
     if not isinstance(chunk, Chunk):
         return [([], chunk)]
     return [(list(x.key), x.value) for x in chunk.entries]
@@ -7,10 +7,11 @@ import pydash as py_
 from box import Box
 from schema import Schema
 
-from choixe.ast.nodes import Node
+from choixe.ast.nodes import DictNode, ListNode, Node
 from choixe.ast.parser import parse
 from choixe.utils.io import dump, load
 from choixe.visitors import Inspection, decode, inspect, process, walk
+from choixe.visitors.unparser import Unparser
 
 
 class XConfig(Box):
@@ -169,9 +170,42 @@ class XConfig(Box):
             actually present. Defaults to False.
         """
 
-        other_chunks = walk(parse(data))
-        for key, new_value in other_chunks:
-            self.deep_set(key, new_value, only_valid_keys=not full_merge)
+        self._deep_update(self, [], parse(data), Unparser(), not full_merge)
+
+    def _deep_update(
+        self,
+        target: Any,
+        path: List[Union[str, int]],
+        node: Node,
+        unparser: Unparser,
+        only_valid_keys: bool,
+    ) -> None:
+        # Descends the target and the node in lockstep, resorting to `deep_set` only
+        # for the leaves that have no matching container in the target.
+        if isinstance(node, DictNode):
+            is_mapping = isinstance(target, Mapping)
+            children = []
+            for k, v in node.nodes.items():
+                key = unparser.visit(k)
+                assert isinstance(key, str), "Only string keys are allowed in dict walk"
+                children.append((key, v, is_mapping and key in target))
+        elif isinstance(node, ListNode):
+            size = len(target) if isinstance(target, list) else 0
+            children = [(i, x, i < size) for i, x in enumerate(node.nodes)]
+        else:
+            new_value = unparser.visit(node)
+            self.deep_set(path, new_value, only_valid_keys=only_valid_keys)
+            return
+
+        for key, child, found in children:
+            if not found:
+                self._deep_update(None, [*path, key], child, unparser, only_valid_keys)
+            elif isinstance(child, (DictNode, ListNode)):
+                self._deep_update(
+                    target[key], [*path, key], child, unparser, only_valid_keys
+                )
+            else:
+                target[key] = unparser.visit(child)
 
     def parse(self) -> Node:
         """Parse this object into a Choixe AST Node.
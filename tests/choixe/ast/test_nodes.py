@@ -0,0 +1,58 @@
+from choixe.ast.nodes import (
+    DictNode,
+    LiteralNode,
+    StrBundleNode,
+    SweepNode,
+    VarNode,
+)
+
+
+class TestHashNode:
+    def test_eq(self):
+        a = VarNode(LiteralNode("a"), default=LiteralNode(10))
+        b = VarNode(LiteralNode("a"), default=LiteralNode(10))
+        assert a == b
+        assert hash(a) == hash(b)
+        assert a != VarNode(LiteralNode("a"), default=LiteralNode(11))
+        assert a != VarNode(LiteralNode("a"))
+
+    def test_eq_different_type(self):
+        assert LiteralNode("a") != StrBundleNode(LiteralNode("a"))
+        assert SweepNode(LiteralNode(1)) != StrBundleNode(LiteralNode(1))
+
+    def test_dict_key(self):
+        key = StrBundleNode(LiteralNode("a"), VarNode(LiteralNode("b")))
+        node = DictNode({key: LiteralNode(10)})
+        assert StrBundleNode(LiteralNode("a"), VarNode(LiteralNode("b"))) in node.nodes
+
+
+class TestLiteralNode:
+    def test_get(self):
+        a = LiteralNode.get("a")
+        assert a is LiteralNode.get("a")
+        assert a == LiteralNode("a")
+
+    def test_get_type(self):
+        assert LiteralNode.get(1).data is not True
+        assert LiteralNode.get(True).data is True
+        assert LiteralNode.get(-0.0) is not LiteralNode.get(0.0)
+
+    def test_get_unhashable(self):
+        assert LiteralNode.get([1, 2]).data == [1, 2]
+
+
+class TestStrBundleNode:
+    def test_flatten(self):
+        var = VarNode(LiteralNode("x"))
+        node = StrBundleNode(
+            LiteralNode("a"),
+            StrBundleNode(LiteralNode("b"), var, LiteralNode("c")),
+            LiteralNode("d"),
+            LiteralNode(10),
+        )
+        assert node.nodes == (
+            LiteralNode("ab"),
+            var,
+            LiteralNode("cd"),
+            LiteralNode(10),
+        )
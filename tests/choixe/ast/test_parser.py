@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from typing import Any
 
 import pytest
@@ -22,6 +23,7 @@ from choixe.ast.nodes import (
 )
 from choixe.ast.parser import (
     ChoixeParsingError,
+    Scanner,
     ChoixeStructValidationError,
     ChoixeSyntaxError,
     parse,
@@ -147,6 +149,19 @@ class TestParse:
         )
         assert parse(expr) == expected
 
+    def test_parse_deep(self):
+        expr = inner = []
+        for _ in range(sys.getrecursionlimit() * 2):
+            inner.append({"a": [], "b": 10})
+            inner = inner[0]["a"]
+
+        node = parse(expr)
+        for _ in range(sys.getrecursionlimit() * 2):
+            assert isinstance(node, ListNode)
+            assert node.nodes[0].nodes[LiteralNode("b")] == LiteralNode(10)
+            node = node.nodes[0].nodes[LiteralNode("a")]
+        assert node == ListNode()
+
 
 class TestStringParse:
     def test_simple(self):
@@ -188,6 +203,17 @@ class TestStringParse:
         )
         assert parse(expr) == expected
 
+    def test_str_bundle_merge(self):
+        expr = "a$ b $$var(x)"
+        expected = StrBundleNode(LiteralNode("a b "), VarNode(LiteralNode("x")))
+        assert parse(expr) == expected
+
+    def test_token_kwargs_read_only(self):
+        token = Scanner().scan("$var(x, default=1)")[0]
+        with pytest.raises(TypeError):
+            token.kwargs["default"] = 2
+        assert parse("$var(x, default=1)") == VarNode(LiteralNode("x"), LiteralNode(1))
+
     def test_uuid(self):
         expr = "$uuid"
         expected = UuidNode()
@@ -209,6 +235,23 @@ class TestStringParse:
         name = LiteralNode(name) if name is not None else None
         assert parse(expr) == TmpDirNode(name)
 
+    @pytest.mark.parametrize(
+        ["expr", "expected"],
+        [
+            [
+                "$var(x,default='a, b=c')",
+                VarNode(LiteralNode("x"), LiteralNode("a, b=c")),
+            ],
+            ["$var( x ,\tdefault = 1e3 )", VarNode(LiteralNode("x"), LiteralNode(1e3))],
+            ["$var(x, default=None,)", VarNode(LiteralNode("x"), LiteralNode(None))],
+            ["$var(x, default=0x10)", VarNode(LiteralNode("x"), LiteralNode(16))],
+            ["$var(x, default='a' 'b')", VarNode(LiteralNode("x"), LiteralNode("ab"))],
+            ["$var(x, default='\\'')", VarNode(LiteralNode("x"), LiteralNode("'"))],
+        ],
+    )
+    def test_call_args(self, expr: str, expected: Any):
+        assert parse(expr) == expected
+
 
 class TestParserRaise:
     def test_unknown_directive(self):
@@ -228,6 +271,10 @@ class TestParserRaise:
             ["I am a string with $import(ba[a)"],
             ["$var(invalid syntax ::) that raises syntaxerror"],
             ["$a+b a"],
+            ["$var(x,\x0bdefault=1)"],
+            ["$var(x\x0b)"],
+            ["$var(x, default=\u0661)"],
+            ["$var(x, default=\u0663.\u0665)"],
         ],
     )
     def test_syntax_error(self, expr: str):
@@ -91,6 +91,23 @@ class TestXConfig:
         expected["c"]["b"][0]["a"] = 2
         assert not DeepDiff(cfg.to_dict(), expected)
 
+    def test_deep_update_directives(self):
+        data = {"a": {"b": 10, "c": [1, 2]}, "d": 1}
+        other = {"a": {"b": {"$for(x)": ["$item"]}, "c": [1, "$var(y)"]}, "d": {"e": 2}}
+        cfg = XConfig(data=data)
+        cfg.deep_update(other)
+        expected = {"a": {"b": {"$for(x)": ["$item"]}, "c": [1, "$var(y)"]}, "d": 1}
+        assert not DeepDiff(cfg.to_dict(), expected)
+
+    def test_full_merge_directives(self):
+        data = {"a": {"b": 10}}
+        call = {"$call": "numpy.array", "$args": {"object": [1, 2]}}
+        other = {"a": {"c": {"$for(x)": ["$item"]}}, "e": {"f": call}}
+        cfg = XConfig(data=data)
+        cfg.deep_update(other, full_merge=True)
+        expected = {"a": {"b": 10, "c": {"$for(x)": ["$item"]}}, "e": {"f": call}}
+        assert not DeepDiff(cfg.to_dict(), expected)
+
     def test_full_merge(self):
         data = {
             "a": {"b": 10},
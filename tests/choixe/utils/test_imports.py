@@ -1,8 +1,11 @@
+import os
+import sys
 from pathlib import Path
+from unittest import mock
 
 import choixe
 import pytest
-from choixe.utils.imports import import_symbol
+from choixe.utils.imports import import_symbol, sys_path
 
 
 def test_import_symbol_fn():
@@ -19,12 +22,54 @@ def test_import_symbol_cls():
     assert res is Console
 
 
+def test_import_symbol_patched():
+    with mock.patch("rich.console.Console", "PATCHED"):
+        assert import_symbol("rich.console.Console") == "PATCHED"
+
+    from rich.console import Console
+
+    assert import_symbol("rich.console.Console") is Console
+
+
 def test_import_symbol_path():
     file_path = Path(choixe.__file__).parent / "ast" / "nodes.py"
     res = import_symbol(f"{str(file_path)}:SweepNode")
     assert res.__name__ == "SweepNode"
 
 
+def test_import_symbol_path_cached(tmp_path: Path):
+    file_path = tmp_path / "my_file.py"
+    file_path.write_text("class A:\n    pass\n")
+    res = import_symbol(f"{str(file_path)}:A")
+    assert import_symbol(f"{str(file_path)}:A") is res
+    assert import_symbol("my_file.py:A", cwd=tmp_path) is res
+
+    # Editing the file invalidates the cache
+    file_path.write_text("class A:\n    x = 10\n")
+    os.utime(file_path, (0, file_path.stat().st_mtime + 10))
+    assert import_symbol(f"{str(file_path)}:A").x == 10
+
+
+def test_import_symbol_path_rewritten(tmp_path: Path):
+    file_path = tmp_path / "my_rewritten_file.py"
+    file_path.write_text("x = 1\n")
+    assert import_symbol(f"{str(file_path)}:x") == 1
+
+    # Rewritten within the same mtime tick
+    mtime_ns = file_path.stat().st_mtime_ns
+    file_path.write_text("x = 100\n")
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+    assert import_symbol(f"{str(file_path)}:x") == 100
+
+
+def test_sys_path_nested(tmp_path: Path):
+    with sys_path(tmp_path):
+        with sys_path(tmp_path):
+            assert sys.path.count(str(tmp_path)) == 1
+        assert sys.path[0] == str(tmp_path)
+    assert str(tmp_path) not in sys.path
+
+
 def test_import_symbol_raise():
     # Non existing module
     with pytest.raises(ImportError):
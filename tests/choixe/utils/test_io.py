@@ -1,7 +1,7 @@
 from pathlib import Path
 
 import pytest
-from choixe.utils.io import dump, load
+from choixe.utils.io import dump, get_extension, load
 
 data = {
     "alice": 10,
@@ -10,9 +10,28 @@ data = {
 }
 
 
-@pytest.mark.parametrize(["ext"], [["yml"], ["yaml"], ["json"]])
+@pytest.mark.parametrize(["ext"], [["yml"], ["yaml"], ["json"], ["YML"]])
 def test_io(tmp_path: Path, ext: str):
     path = tmp_path / f"config.{ext}"
     dump(data, path)
     loaded = load(path)
     assert loaded == data
+
+
+@pytest.mark.parametrize(
+    ["name", "ext"],
+    [
+        ["config.yml", "yml"],
+        ["a.b.JSON", "JSON"],
+        [".yml", "yml"],
+        ["Makefile", "Makefile"],
+    ],
+)
+def test_get_extension(name: str, ext: str):
+    assert get_extension(Path(name)) == ext
+
+
+def test_io_dotfile(tmp_path: Path):
+    path = tmp_path / ".yml"
+    dump(data, path)
+    assert load(path) == data
@@ -72,6 +72,16 @@ class TestProcessor:
         expected = [{"a": "I am a red cow"}]
         self._expectation_test(data, expected)
 
+    def test_var_repeated(self):
+        data = ["$var(color.hue)", "$var(color.sat, default=1)", "$var(color.sat)"]
+        expected = [["red", 1, None]]
+        self._expectation_test(data, expected)
+
+    def test_var_list_index(self):
+        data = "$var('collection1.2')"
+        expected = [1002]
+        self._expectation_test(data, expected)
+
     def test_env_plain(self):
         data = "$var(VAR1, default='blue', env=True)"
         expected = ["yellow"]
@@ -103,6 +113,23 @@ class TestProcessor:
         finally:
             os.chdir(prev_cwd)
 
+    def test_import_modified(self, tmp_path: Path):
+        path = tmp_path / "cfg.yml"
+        data = {"a": f'$import("{PurePosixPath(path)}")'}
+
+        path.write_text("foo: 10\n")
+        self._expectation_test(data, [{"a": {"foo": 10}}])
+
+        path.write_text("foo: 20\n")
+        os.utime(path, (0, path.stat().st_mtime + 10))
+        self._expectation_test(data, [{"a": {"foo": 20}}])
+
+        # Rewritten within the same mtime tick
+        mtime_ns = path.stat().st_mtime_ns
+        path.write_text("foo: 300\n")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        self._expectation_test(data, [{"a": {"foo": 300}}])
+
     def test_sweep_base(self):
         data = {
             "a": {
@@ -180,3 +180,35 @@ from deepdiff import DeepDiff
 )
 def test_unparse(node: Node, expected: Any):
     assert not DeepDiff(unparse(node), expected)
+
+
+def test_unparse_shared_nodes():
+    var = VarNode(LiteralNode("x"), default=LiteralNode(1))
+    sweep = SweepNode(LiteralNode(1), DictNode({LiteralNode("a"): LiteralNode(2)}))
+    node = ListNode(
+        var, var, VarNode(LiteralNode("x"), default=LiteralNode(True)), sweep, sweep
+    )
+    res = unparse(node)
+    expected_sweep = {
+        "$directive": "sweep",
+        "$args": [1, {"a": 2}],
+        "$kwargs": {},
+    }
+    assert not DeepDiff(
+        res,
+        [
+            "$var(x, default=1)",
+            "$var(x, default=1)",
+            "$var(x, default=True)",
+            expected_sweep,
+            expected_sweep,
+        ],
+    )
+    assert res[3] is not res[4]
+
+
+@pytest.mark.parametrize(["size"], [[2], [3]])
+def test_unparse_str_bundle_non_str(size: int):
+    node = StrBundleNode.build([LiteralNode(i) for i in range(size)])
+    with pytest.raises(TypeError):
+        unparse(node)